@@ -0,0 +1,112 @@
+# Financial health rule engine: thresholds live in a declarative rule table and
+# are evaluated as array operations, so one call scores a single plan, every
+# month of a projection, or a whole batch of households.
+import numpy as np
+import pandas as pd
+
+# direction "min": metric should be at least `threshold`, score grows to 1 at `target`
+# direction "max": metric should be at most `threshold`, score drops to 0 at 2x `target`
+HEALTH_RULES = pd.DataFrame([
+    {
+        "rule": "savings_rate",
+        "metric": "savings_rate",
+        "direction": "min",
+        "threshold": 20.0,
+        "target": 20.0,
+        "weight": 0.35,
+        "message": "💡 Tingkatkan rasio tabungan Anda minimal 20% dari pendapatan"
+    },
+    {
+        "rule": "debt_ratio",
+        "metric": "debt_ratio",
+        "direction": "max",
+        "threshold": 30.0,
+        "target": 30.0,
+        "weight": 0.25,
+        "message": "💡 Rasio cicilan Anda tinggi. Pertimbangkan untuk melunasi utang dengan bunga tinggi terlebih dahulu"
+    },
+    {
+        "rule": "emergency_fund",
+        "metric": "emergency_months",
+        "direction": "min",
+        "threshold": 3.0,
+        "target": 6.0,
+        "weight": 0.25,
+        "message": "💡 Dana darurat Anda hanya {emergency_months:.1f} bulan. Targetkan minimal 3-6 bulan pengeluaran"
+    },
+    {
+        "rule": "deficit",
+        "metric": "surplus",
+        "direction": "min",
+        "threshold": 0.0,
+        "target": 0.0,
+        "weight": 0.15,
+        "message": "💡 Pengeluaran melebihi pendapatan. Tinjau kategori pengeluaran terbesar untuk penghematan"
+    },
+])
+
+HEALTHY_MESSAGE = "🎉 Keuangan Anda dalam kondisi sehat! Pertahankan kebiasaan baik ini"
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator * scale, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def health_metrics(income, expenses, debt_payments, emergency_fund):
+    # Scalars or arrays (broadcast together); emergency_fund is the balance actually held
+    income, expenses, debt_payments, emergency_fund = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (income, expenses, debt_payments, emergency_fund))
+    )
+    return pd.DataFrame({
+        "savings_rate": _ratio(income - expenses, income, 100),
+        "debt_ratio": _ratio(debt_payments, income, 100),
+        "emergency_months": _ratio(emergency_fund, expenses),
+        "surplus": income - expenses,
+    })
+
+
+def projection_metrics(projection, debt_payments, emergency_contribution, emergency_balance=0.0):
+    # One row per projected month; the emergency fund accumulates month by month
+    months = np.arange(1, len(projection) + 1)
+    return health_metrics(
+        projection["Pendapatan"].to_numpy(),
+        projection["Pengeluaran"].to_numpy(),
+        debt_payments,
+        emergency_balance + emergency_contribution * months
+    )
+
+
+def evaluate_health(metrics, rules=HEALTH_RULES):
+    values = metrics[rules["metric"]].to_numpy(dtype=float)  # shape (plans, rules)
+    threshold = rules["threshold"].to_numpy(dtype=float)
+    target = rules["target"].to_numpy(dtype=float)
+    weight = rules["weight"].to_numpy(dtype=float)
+    is_min = (rules["direction"] == "min").to_numpy()
+
+    # A missing (NaN) metric fails its rule: flagged and scored 0, so batch rows
+    # with incomplete data are penalised and still get a recommendation
+    missing = np.isnan(values)
+    flags = missing | np.where(is_min, values < threshold, values > threshold)
+
+    safe_target = np.where(target != 0, target, 1.0)
+    min_score = np.where(target != 0, values / safe_target, (values >= threshold).astype(float))
+    max_score = np.where(target != 0, 2 - values / safe_target, (values <= threshold).astype(float))
+    scores = np.where(missing, 0.0, np.clip(np.where(is_min, min_score, max_score), 0, 1))
+
+    result = metrics.copy()
+    for i, rule in enumerate(rules["rule"]):
+        result[f"flag_{rule}"] = flags[:, i]
+        result[f"score_{rule}"] = scores[:, i]
+    result["score"] = scores @ weight / weight.sum() * 100
+    return result
+
+
+def health_recommendations(result, rules=HEALTH_RULES):
+    # Messages for one evaluated row (a pandas Series from evaluate_health)
+    flagged = rules[[bool(result[f"flag_{rule}"]) for rule in rules["rule"]]]
+    messages = [message.format(**result) for message in flagged["message"]]
+    return messages or [HEALTHY_MESSAGE]
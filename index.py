@@ -1,10 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, timedelta
+from datetime import datetime
 from io import BytesIO
 import calendar
 import numpy as np
+from report import ReportService, plan_hash
+from rendering import paginate_frame, projection_chart
+from health import evaluate_health, health_metrics, health_recommendations, projection_metrics
 
 # Page configuration
 st.set_page_config(
@@ -106,9 +109,9 @@ with st.sidebar:
     planning_months = st.slider(
         "Jumlah Bulan untuk Perencanaan", 
         min_value=1, 
-        max_value=36, 
+        max_value=600, 
         value=12,
-        help="Pilih berapa bulan ke depan untuk perencanaan keuangan"
+        help="Pilih berapa bulan ke depan untuk perencanaan keuangan (hingga 50 tahun)"
     )
     
     # NEW FEATURE 2: Income Growth Projection
@@ -335,6 +338,15 @@ with col2:
                     key="dana_darurat",
                     format="%d"
                 )
+            saldo_dana_darurat = st.number_input(
+                "Saldo Dana Darurat Saat Ini (Rp)",
+                min_value=0,
+                value=0,
+                step=1000000,
+                key="saldo_dana_darurat",
+                format="%d",
+                help="Dana darurat yang sudah terkumpul hari ini, dipakai untuk cek kesehatan keuangan"
+            )
 
         with st.expander("Tabungan Khusus", expanded=True):
             # NEW FEATURE 4: Multiple Savings Goals
@@ -422,7 +434,11 @@ def calculate_projection(months, income_growth_rate):
     
     for month in range(months):
         month_data = {
-            "Bulan": (current_date + timedelta(days=30*month)).strftime("%B %Y"),
+            "Bulan": datetime(
+                current_date.year + (current_date.month - 1 + month) // 12,
+                (current_date.month - 1 + month) % 12 + 1,
+                1
+            ).strftime("%B %Y"),
             "Pendapatan": current_income,
             "Pengeluaran": total_pengeluaran,
             "Tabungan": current_income - total_pengeluaran,
@@ -435,6 +451,15 @@ def calculate_projection(months, income_growth_rate):
 
 projection_df = calculate_projection(planning_months, income_growth)
 
+# Health rules scored in one pass: the plan today (current emergency balance) and every
+# projected month (balance plus the monthly contributions accumulated so far)
+plan_health = evaluate_health(health_metrics(
+    gaji_total, total_pengeluaran, total_cicilan, saldo_dana_darurat
+)).iloc[0]
+projection_df["Skor Kesehatan"] = evaluate_health(
+    projection_metrics(projection_df, total_cicilan, dana_darurat, saldo_dana_darurat)
+)["score"].round(1).to_numpy()
+
 # Summary section with enhanced layout
 st.markdown("---")
 st.markdown("<h2 class='header'>📊 Ringkasan Keuangan</h2>", unsafe_allow_html=True)
@@ -460,12 +485,15 @@ with summary_cols[0]:
     }
 
     df_summary = pd.DataFrame.from_dict(summary, orient='index', columns=['Amount'])
-    df_summary['Percentage'] = (df_summary['Amount'] / gaji_total * 100).round(1)
-    df_summary['Amount'] = df_summary['Amount'].apply(lambda x: f"Rp {x:,.0f}")
-    df_summary['Percentage'] = df_summary['Percentage'].apply(lambda x: f"{x}%")
+    df_summary['Percentage'] = (df_summary['Amount'] / gaji_total * 100).round(1) if gaji_total > 0 else 0.0
+    df_summary.index.name = "Kategori"
     
+    # Columns stay numeric; formatting is applied only at render time
     st.dataframe(
-        df_summary,
+        df_summary.style.format({
+            "Amount": "Rp {:,.0f}",
+            "Percentage": "{:.1f}%"
+        }),
         use_container_width=True,
         column_config={
             "index": st.column_config.Column("Kategori", width="medium"),
@@ -476,7 +504,7 @@ with summary_cols[0]:
 
 with summary_cols[1]:
     # Enhanced financial summary card
-    savings_rate = ((gaji_total - total_pengeluaran) / gaji_total * 100) if gaji_total > 0 else 0
+    savings_rate = float(plan_health["savings_rate"])
     
     st.markdown(f"""
     <div class='summary-card'>
@@ -558,12 +586,10 @@ with tab1:
 with tab2:
     # Monthly projection chart
     st.subheader(f"Proyeksi {planning_months} Bulan Ke Depan")
-    fig = px.line(
+    fig = projection_chart(
         projection_df,
-        x="Bulan",
         y=["Pendapatan", "Pengeluaran"],
-        color_discrete_map={"Pendapatan": "#2e86ab", "Pengeluaran": "#f18f01"},
-        markers=True
+        color_discrete_map={"Pendapatan": "#2e86ab", "Pengeluaran": "#f18f01"}
     )
     fig.update_layout(
         yaxis_title="Amount (Rp)",
@@ -572,13 +598,14 @@ with tab2:
     )
     st.plotly_chart(fig, use_container_width=True)
     
-    # Show projection table
+    # Show projection table (paginated so only one page is styled and sent)
     st.dataframe(
-        projection_df.style.format({
+        paginate_frame(projection_df, key="projection_page").style.format({
             "Pendapatan": "Rp {:,.0f}",
             "Pengeluaran": "Rp {:,.0f}",
             "Tabungan": "Rp {:,.0f}",
-            "Akumulasi Tabungan": "Rp {:,.0f}"
+            "Akumulasi Tabungan": "Rp {:,.0f}",
+            "Skor Kesehatan": "{:.0f}"
         }),
         use_container_width=True
     )
@@ -586,10 +613,10 @@ with tab2:
 with tab3:
     # Savings accumulation chart
     st.subheader("Akumulasi Tabungan Jangka Panjang")
-    fig = px.area(
+    fig = projection_chart(
         projection_df,
-        x="Bulan",
         y="Akumulasi Tabungan",
+        area=True,
         color_discrete_sequence=["#28a745"]
     )
     fig.update_layout(
@@ -628,11 +655,19 @@ with tab3:
 st.markdown("---")
 st.markdown("<h2 class='header'>🩺 Cek Kesehatan Keuangan</h2>", unsafe_allow_html=True)
 
+emergency_months = float(plan_health["emergency_months"])
+debt_ratio = float(plan_health["debt_ratio"])
+
+st.metric(
+    "Skor Kesehatan Keuangan",
+    f"{plan_health['score']:.0f}/100",
+    help="Skor gabungan berbobot dari rasio tabungan, rasio cicilan, dana darurat, dan surplus bulanan"
+)
+
 health_cols = st.columns(3)
 
 with health_cols[0]:
-    # Emergency fund check
-    emergency_months = (dana_darurat * planning_months) / total_pengeluaran if total_pengeluaran > 0 else 0
+    # Emergency fund check (current balance vs. monthly expenses)
     st.metric(
         "Dana Darurat", 
         f"{emergency_months:.1f} bulan", 
@@ -642,7 +677,6 @@ with health_cols[0]:
 
 with health_cols[1]:
     # Debt-to-income ratio
-    debt_ratio = (total_cicilan / gaji_total * 100) if gaji_total > 0 else 0
     st.metric(
         "Rasio Cicilan", 
         f"{debt_ratio:.1f}%", 
@@ -664,17 +698,7 @@ with health_cols[2]:
 st.markdown("---")
 st.markdown("<h2 class='header'>💡 Rekomendasi & Tips</h2>", unsafe_allow_html=True)
 
-recommendations = []
-if savings_rate < 20:
-    recommendations.append("💡 Tingkatkan rasio tabungan Anda minimal 20% dari pendapatan")
-if debt_ratio > 30:
-    recommendations.append("💡 Rasio cicilan Anda tinggi. Pertimbangkan untuk melunasi utang dengan bunga tinggi terlebih dahulu")
-if emergency_months < 3:
-    recommendations.append(f"💡 Dana darurat Anda hanya {emergency_months:.1f} bulan. Targetkan minimal 3-6 bulan pengeluaran")
-if sisa_gaji < 0:
-    recommendations.append("💡 Pengeluaran melebihi pendapatan. Tinjau kategori pengeluaran terbesar untuk penghematan")
-if not recommendations:
-    recommendations.append("🎉 Keuangan Anda dalam kondisi sehat! Pertahankan kebiasaan baik ini")
+recommendations = health_recommendations(plan_health)
 
 for rec in recommendations:
     st.markdown(f"- {rec}")
@@ -697,7 +721,24 @@ for tip in tips:
 st.markdown("---")
 st.markdown("<h2 class='header'>📤 Export & Share</h2>", unsafe_allow_html=True)
 
-export_cols = st.columns(3)
+@st.cache_data(max_entries=64, ttl=3600)
+def export_columnar(df, fmt):
+    # Cached on table contents, so reruns with an unchanged plan skip re-encoding.
+    # The cache is shared by all sessions, hence the entry and age bounds.
+    # Arrow IPC is written uncompressed so consumers can pa.memory_map it zero-copy.
+    buffer = BytesIO()
+    if fmt == "parquet":
+        df.to_parquet(buffer, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(buffer, compression="uncompressed")
+    return buffer.getvalue()
+
+columnar_tables = {
+    "proyeksi": projection_df,
+    "ringkasan": df_summary.reset_index()
+}
+
+export_cols = st.columns(4)
 with export_cols[0]:
     # Export as CSV
     csv = projection_df.to_csv(index=False).encode('utf-8')
@@ -713,6 +754,12 @@ with export_cols[1]:
     with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
         projection_df.to_excel(writer, index=False, sheet_name='Proyeksi')
         df_summary.to_excel(writer, sheet_name='Ringkasan')
+        rupiah_format = writer.book.add_format({'num_format': '"Rp" #,##0'})
+        writer.sheets['Proyeksi'].set_column(1, 4, 20, rupiah_format)
+        writer.sheets['Ringkasan'].set_column(0, 0, 24)
+        writer.sheets['Ringkasan'].set_column(1, 1, 20, rupiah_format)
+        percent_format = writer.book.add_format({'num_format': '0.0"%"'})
+        writer.sheets['Ringkasan'].set_column(2, 2, 18, percent_format)
     excel_data = excel_buffer.getvalue()
     st.download_button(
         label="📊 Export ke Excel",
@@ -721,10 +768,89 @@ with export_cols[1]:
         mime="application/vnd.ms-excel"
     )
 with export_cols[2]:
+    # Export as columnar Parquet / Arrow IPC for analytics jobs
+    columnar_format = st.radio("Format Kolumnar", ["parquet", "arrow"], horizontal=True)
+    columnar_mime = "application/vnd.apache.parquet" if columnar_format == "parquet" else "application/vnd.apache.arrow.file"
+    for name, table in columnar_tables.items():
+        st.download_button(
+            label=f"🗃️ Export {name.capitalize()} ({columnar_format})",
+            data=export_columnar(table, columnar_format),
+            file_name=f"financial_plan_{name}.{columnar_format}",
+            mime=columnar_mime,
+            key=f"export_{name}"
+        )
+with export_cols[3]:
     # Shareable link
     if st.button("🔗 Buat Link Share"):
         st.warning("Fitur ini membutuhkan integrasi dengan database. Coming soon!")
 
+# ===========================================
+# NEW FEATURE 11: Printable Report (background)
+# ===========================================
+@st.cache_resource
+def get_report_service():
+    return ReportService(max_workers=2)
+
+st.markdown("---")
+st.markdown("<h2 class='header'>🖨️ Laporan Keuangan</h2>", unsafe_allow_html=True)
+
+report_plan = {
+    "planning_months": planning_months,
+    "summary": summary,
+    "projection": projection_df.to_dict("records"),
+    "health": {
+        "emergency_months": emergency_months,
+        "debt_ratio": debt_ratio,
+        "savings_rate": savings_rate,
+        "score": float(plan_health["score"])
+    },
+    "recommendations": recommendations,
+    "tips": tips
+}
+report_service = get_report_service()
+
+if st.button("📝 Buat Laporan PDF/HTML"):
+    st.session_state.report_key = report_service.submit(report_plan)
+
+def show_report_status(report_key, polling):
+    report_status = report_service.status(report_key)
+    report = report_service.result(report_key) if report_status == "done" else None
+    if polling and report_status != "pending":
+        # Finished: rerun the whole page once so the fragment stops polling
+        st.rerun()
+    if report_status == "pending":
+        st.info("⏳ Laporan sedang dibuat di latar belakang. Halaman ini diperbarui otomatis.")
+    elif report is not None:
+        report_cols = st.columns(2)
+        with report_cols[0]:
+            st.download_button(
+                label="📄 Unduh Laporan PDF",
+                data=report["pdf"],
+                file_name="laporan_keuangan.pdf",
+                mime="application/pdf"
+            )
+        with report_cols[1]:
+            st.download_button(
+                label="🌐 Unduh Laporan HTML",
+                data=report["html"],
+                file_name="laporan_keuangan.html",
+                mime="text/html"
+            )
+    elif report_status == "failed":
+        st.error(f"⚠️ Gagal membuat laporan: {report_service.error(report_key)}")
+    else:
+        st.warning("Laporan sudah tidak tersedia di cache. Klik \"Buat Laporan PDF/HTML\" untuk membuat ulang.")
+
+report_key = st.session_state.get("report_key")
+if report_key:
+    if report_key != plan_hash(report_plan):
+        st.caption("Data berubah sejak laporan dibuat. Buat ulang untuk memperbarui laporan.")
+    elif report_service.status(report_key) == "missing":
+        # The service is shared by all sessions, so other jobs may have evicted this one
+        report_service.submit(report_plan)
+    polling = report_service.status(report_key) == "pending"
+    st.fragment(run_every=2 if polling else None)(show_report_status)(report_key, polling)
+
 # Footer with enhanced info
 st.markdown("---")
 st.markdown("""
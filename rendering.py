@@ -0,0 +1,86 @@
+# Adaptive rendering for long projection horizons: shape-preserving
+# downsampling, WebGL traces above a point budget and table pagination.
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+CHART_POINT_BUDGET = 500
+TABLE_PAGE_SIZE = 120
+
+
+def lttb_indices(values, threshold):
+    # Largest-Triangle-Three-Buckets: keeps the points that preserve the curve shape
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float)
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_frame(df, columns, budget=CHART_POINT_BUDGET):
+    if len(df) <= budget:
+        return df
+    per_column = max(3, budget // len(columns))
+    keep = np.unique(np.concatenate([lttb_indices(df[col].to_numpy(), per_column) for col in columns]))
+    return df.iloc[keep]
+
+
+def projection_chart(df, y, area=False, budget=CHART_POINT_BUDGET, **kwargs):
+    if len(df) <= budget:
+        if area:
+            return px.area(df, x="Bulan", y=y, **kwargs)
+        return px.line(df, x="Bulan", y=y, markers=True, **kwargs)
+
+    # Long horizons: decimated WebGL traces without markers keep the payload bounded.
+    # Points are placed by month position (not the "Bulan" category) so the gaps
+    # LTTB leaves stay proportional; month names are only used as tick labels.
+    columns = y if isinstance(y, list) else [y]
+    positioned = df.reset_index(drop=True).assign(**{"Bulan Ke": np.arange(len(df))})
+    fig = px.line(
+        downsample_frame(positioned, columns, budget),
+        x="Bulan Ke",
+        y=y,
+        hover_data=["Bulan"],
+        render_mode="webgl",
+        **kwargs
+    )
+    if area:
+        fig.update_traces(fill="tozeroy")
+    ticks = np.unique(np.linspace(0, len(df) - 1, 12).round().astype(int))
+    fig.update_xaxes(tickvals=ticks, ticktext=positioned["Bulan"].iloc[ticks].tolist(), title_text="Bulan")
+    return fig
+
+
+def page_bounds(n_rows, page, page_size=TABLE_PAGE_SIZE):
+    # 1-based page number -> (pages, start, end) row slice, clamped to the table
+    pages = max(1, -(-n_rows // page_size))
+    page = min(max(1, int(page)), pages)
+    start = (page - 1) * page_size
+    return pages, start, min(start + page_size, n_rows)
+
+
+def paginate_frame(df, key, page_size=TABLE_PAGE_SIZE):
+    if len(df) <= page_size:
+        return df
+    pages, _, _ = page_bounds(len(df), 1, page_size)
+    page = st.number_input("Halaman", min_value=1, max_value=pages, value=1, key=key)
+    _, start, end = page_bounds(len(df), page, page_size)
+    st.caption(f"Menampilkan baris {start + 1}-{end} dari {len(df)}")
+    return df.iloc[start:end]
@@ -0,0 +1,352 @@
+# Family financial plan report: renders a full plan to multi-page PDF and HTML.
+# Usable from the Streamlit app (ReportService, background threads) and from
+# batch jobs (generate_reports / `python report.py plans.jsonl output_dir`).
+import argparse
+import base64
+import hashlib
+import html
+import json
+import os
+import tempfile
+import textwrap
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+from io import BytesIO
+
+import pandas as pd
+from matplotlib import font_manager
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.ft2font import FT2Font
+
+A4_SIZE = (8.27, 11.69)
+ROWS_PER_PAGE = 30
+WRAP_WIDTH = 95
+LINE_HEIGHT = 0.02
+PALETTE = ["#2e86ab", "#f18f01", "#28a745", "#dc3545", "#6f42c1", "#20c997",
+           "#fd7e14", "#6c757d", "#e83e8c", "#17a2b8", "#ffc107", "#343a40"]
+MONEY_COLUMNS = ["Pendapatan", "Pengeluaran", "Tabungan", "Akumulasi Tabungan"]
+
+
+def _umask_file_mode():
+    # Mode a plain open() would give new files; mkstemp always uses 0600
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+FILE_MODE = _umask_file_mode()
+
+
+def plan_hash(plan):
+    payload = json.dumps(plan, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def rupiah(x):
+    return f"Rp {x:,.0f}"
+
+
+def summary_frame(plan):
+    summary = plan["summary"]
+    income = summary.get("Pendapatan", 0)
+    df = pd.DataFrame({"Kategori": list(summary.keys()), "Amount": list(summary.values())})
+    df["Percentage"] = (df["Amount"] / income * 100).round(1) if income > 0 else 0.0
+    return df
+
+
+def formatted(df):
+    # Text copy of a numeric frame for printing; the source frame stays numeric
+    out = df.copy()
+    for col in out.columns:
+        if col in MONEY_COLUMNS or col == "Amount":
+            out[col] = out[col].map(rupiah)
+        elif col == "Percentage":
+            out[col] = out[col].map(lambda x: f"{x:.1f}%")
+    return out
+
+
+def health_lines(plan):
+    health = plan["health"]
+    return [
+        f"Skor Kesehatan Keuangan: {health['score']:.0f}/100",
+        f"Dana Darurat: {health['emergency_months']:.1f} bulan (ideal 3-6 bulan)",
+        f"Rasio Cicilan: {health['debt_ratio']:.1f}% (sebaiknya <30%)",
+        f"Rasio Tabungan: {health['savings_rate']:.1f}% (ideal 20%)",
+    ]
+
+
+@lru_cache(maxsize=1)
+def pdf_charset():
+    font = FT2Font(font_manager.findfont(font_manager.FontProperties()))
+    return frozenset(font.get_charmap())
+
+
+def pdf_text(text):
+    # Drop characters the PDF font has no glyph for (emoji would print as boxes)
+    charset = pdf_charset()
+    return "".join(ch for ch in text if ord(ch) in charset or ch.isspace()).strip()
+
+
+def empty_chart(ax, title):
+    ax.axis("off")
+    ax.text(0.5, 0.5, "Tidak ada data pengeluaran", ha="center", va="center", color="#6c757d")
+    ax.set_title(title)
+
+
+def chart_figures(plan):
+    expenses = summary_frame(plan).iloc[1:]  # Exclude income
+    expenses = expenses[expenses["Amount"] > 0]
+    projection = pd.DataFrame(plan["projection"])
+    x = range(len(projection))
+    tick_step = max(1, len(projection) // 12)
+
+    figures = []
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    if expenses.empty:
+        empty_chart(ax, "Komposisi Pengeluaran")
+    else:
+        ax.pie(expenses["Amount"], labels=expenses["Kategori"], autopct="%1.0f%%",
+               colors=PALETTE, wedgeprops={"width": 0.6}, textprops={"fontsize": 7})
+        ax.set_title("Komposisi Pengeluaran")
+    figures.append(fig)
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    if expenses.empty:
+        empty_chart(ax, "Perbandingan Kategori")
+    else:
+        ax.barh(expenses["Kategori"], expenses["Amount"], color=PALETTE)
+        ax.invert_yaxis()
+        ax.set_xlabel("Amount (Rp)")
+        ax.set_title("Perbandingan Kategori")
+    fig.tight_layout()
+    figures.append(fig)
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    ax.plot(x, projection["Pendapatan"], color="#2e86ab", label="Pendapatan")
+    ax.plot(x, projection["Pengeluaran"], color="#f18f01", label="Pengeluaran")
+    ax.fill_between(x, projection["Akumulasi Tabungan"], color="#28a745", alpha=0.3,
+                    label="Akumulasi Tabungan")
+    ax.set_xticks(list(x)[::tick_step])
+    ax.set_xticklabels(projection["Bulan"].iloc[::tick_step], rotation=45, ha="right", fontsize=7)
+    ax.set_ylabel("Amount (Rp)")
+    ax.set_title(f"Proyeksi {plan['planning_months']} Bulan Ke Depan")
+    ax.legend()
+    fig.tight_layout()
+    figures.append(fig)
+
+    return figures
+
+
+def text_pages(title, sections):
+    # Lines are wrapped here so the y step matches what is drawn; overflow starts a new page
+    fig = Figure(figsize=A4_SIZE)
+    fig.text(0.08, 0.95, title, fontsize=16, weight="bold", color="#2e86ab")
+    pages = [fig]
+    y = 0.9
+    for heading, lines in sections:
+        rows = [(pdf_text(heading), 0.08, 12, "bold")]
+        for line in lines:
+            wrapped = textwrap.wrap(pdf_text(line), WRAP_WIDTH) or [""]
+            rows.append((f"- {wrapped[0]}", 0.1, 9, "normal"))
+            rows.extend((part, 0.115, 9, "normal") for part in wrapped[1:])
+        for text, x, size, weight in rows:
+            if y < 0.05:
+                fig = Figure(figsize=A4_SIZE)
+                pages.append(fig)
+                y = 0.95
+            fig.text(x, y, text, fontsize=size, weight=weight)
+            y -= LINE_HEIGHT * (1.5 if weight == "bold" else 1)
+        y -= LINE_HEIGHT
+    return pages
+
+
+def table_pages(title, df):
+    pages = []
+    for start in range(0, len(df), ROWS_PER_PAGE):
+        chunk = df.iloc[start:start + ROWS_PER_PAGE]
+        fig = Figure(figsize=A4_SIZE)
+        ax = fig.add_subplot()
+        ax.axis("off")
+        ax.set_title(title, fontsize=12, weight="bold", loc="left")
+        table = ax.table(cellText=chunk.values, colLabels=list(chunk.columns), loc="upper center")
+        table.auto_set_font_size(False)
+        table.set_fontsize(7)
+        table.scale(1, 1.3)
+        pages.append(fig)
+    return pages
+
+
+def render_pdf(plan, charts):
+    summary = summary_frame(plan)
+    income = summary["Amount"].iloc[0]
+    expenses = summary["Amount"].iloc[1:].sum()
+    overview = [
+        f"Total Pendapatan: {rupiah(income)}",
+        f"Total Pengeluaran: {rupiah(expenses)}",
+        f"Sisa Gaji: {rupiah(income - expenses)}",
+        f"Rentang Perencanaan: {plan['planning_months']} bulan",
+    ]
+
+    buffer = BytesIO()
+    with PdfPages(buffer) as pdf:
+        for fig in text_pages("Laporan Keuangan Keluarga", [
+            ("Ringkasan Bulanan", overview),
+            ("Cek Kesehatan Keuangan", health_lines(plan)),
+            ("Rekomendasi", plan["recommendations"]),
+            ("Tips", plan.get("tips", [])),
+        ]):
+            pdf.savefig(fig)
+        for fig in table_pages("Ringkasan Keuangan", formatted(summary)):
+            pdf.savefig(fig)
+        for fig in charts:
+            pdf.savefig(fig)
+        for fig in table_pages("Proyeksi Bulanan", formatted(pd.DataFrame(plan["projection"]))):
+            pdf.savefig(fig)
+    return buffer.getvalue()
+
+
+def bullet_list(lines):
+    return "".join(f"<li>{html.escape(line)}</li>" for line in lines)
+
+
+def render_html(plan, charts):
+    images = []
+    for fig in charts:
+        png = BytesIO()
+        fig.savefig(png, format="png", dpi=100)
+        images.append(base64.b64encode(png.getvalue()).decode("ascii"))
+
+    page = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Laporan Keuangan Keluarga</title>
+<style>
+body {{ font-family: sans-serif; max-width: 1000px; margin: 2rem auto; }}
+h1, h2 {{ color: #2e86ab; border-bottom: 2px solid #f18f01; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border: 1px solid #ddd; padding: 4px 8px; text-align: right; }}
+img {{ max-width: 100%; page-break-inside: avoid; }}
+@media print {{ h2 {{ page-break-before: always; }} }}
+</style></head><body>
+<h1>Laporan Keuangan Keluarga</h1>
+<h2>Ringkasan Keuangan</h2>
+{formatted(summary_frame(plan)).to_html(index=False)}
+<h2>Cek Kesehatan Keuangan</h2><ul>{bullet_list(health_lines(plan))}</ul>
+<h2>Rekomendasi &amp; Tips</h2><ul>{bullet_list(plan["recommendations"] + plan.get("tips", []))}</ul>
+<h2>Grafik</h2>
+{"".join(f'<img src="data:image/png;base64,{img}">' for img in images)}
+<h2>Proyeksi Bulanan</h2>
+{formatted(pd.DataFrame(plan["projection"])).to_html(index=False)}
+</body></html>"""
+    return page.encode("utf-8")
+
+
+def render_report(plan):
+    charts = chart_figures(plan)
+    return {"pdf": render_pdf(plan, charts), "html": render_html(plan, charts)}
+
+
+class ReportService:
+    # Renders reports on a worker pool and caches finished ones by plan hash,
+    # so the page only submits a job and polls its status on later reruns.
+    def __init__(self, max_workers=2, max_cached=64):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._max_cached = max_cached
+
+    def submit(self, plan):
+        key = plan_hash(plan)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or (job.done() and job.exception() is not None):
+                self._jobs[key] = self._executor.submit(render_report, plan)
+                self._evict()
+        return key
+
+    def status(self, key):
+        job = self._jobs.get(key)
+        if job is None:
+            return "missing"
+        if not job.done():
+            return "pending"
+        return "failed" if job.exception() is not None else "done"
+
+    def wait(self, key, timeout=None):
+        # Block until the job finishes (or timeout), then return its status
+        job = self._jobs.get(key)
+        if job is not None:
+            wait([job], timeout=timeout)
+        return self.status(key)
+
+    def result(self, key):
+        # None when the job was evicted in the meantime
+        job = self._jobs.get(key)
+        return job.result() if job is not None else None
+
+    def error(self, key):
+        job = self._jobs.get(key)
+        return job.exception() if job is not None else None
+
+    def _evict(self):
+        finished = [key for key, job in self._jobs.items() if job.done()]
+        while len(self._jobs) > self._max_cached and finished:
+            del self._jobs[finished.pop(0)]
+
+
+def write_atomic(path, data):
+    # Temp file in the same directory + os.replace: readers never see a partial report
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_report(plan, output_dir):
+    key = plan_hash(plan)
+    paths = {fmt: os.path.join(output_dir, f"{key}.{fmt}") for fmt in ("pdf", "html")}
+    if not all(os.path.exists(path) for path in paths.values()):
+        for fmt, data in render_report(plan).items():
+            write_atomic(paths[fmt], data)
+    return paths
+
+
+def generate_reports(plans, output_dir, max_workers=None):
+    # Batch mode: one process per CPU, reports already on disk are reused by hash.
+    # Returns {plan_hash: {"pdf": path, "html": path} | {"error": message}}.
+    os.makedirs(output_dir, exist_ok=True)
+    unique_plans = {plan_hash(plan): plan for plan in plans}
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {key: pool.submit(write_report, plan, output_dir) for key, plan in unique_plans.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results[key] = {"error": f"{type(e).__name__}: {e}"}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate family financial plan reports in batch")
+    parser.add_argument("plans", help="JSON Lines file, one plan per line")
+    parser.add_argument("output_dir", help="Directory for <plan-hash>.pdf / .html files")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.plans, encoding="utf-8") as f:
+        plans = [json.loads(line) for line in f if line.strip()]
+    results = generate_reports(plans, args.output_dir, max_workers=args.workers)
+    failed = {key: result["error"] for key, result in results.items() if "error" in result}
+    for key, error in failed.items():
+        print(f"GAGAL {key}: {error}")
+    print(f"{len(results) - len(failed)} laporan tersimpan di {args.output_dir}, {len(failed)} gagal")
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from health import (
+    HEALTH_RULES,
+    HEALTHY_MESSAGE,
+    evaluate_health,
+    health_metrics,
+    health_recommendations,
+    projection_metrics,
+)
+
+
+def evaluate_one(income, expenses, debt, emergency_fund):
+    return evaluate_health(health_metrics(income, expenses, debt, emergency_fund)).iloc[0]
+
+
+def test_healthy_plan_scores_full_marks():
+    result = evaluate_one(50_000_000, 30_000_000, 5_000_000, 200_000_000)
+    assert not result[[f"flag_{rule}" for rule in HEALTH_RULES["rule"]]].any()
+    assert result["score"] == pytest.approx(100.0)
+    assert health_recommendations(result) == [HEALTHY_MESSAGE]
+
+
+def test_zero_income_does_not_divide_by_zero():
+    with np.errstate(all="raise"):
+        result = evaluate_one(0, 0, 0, 0)
+    assert result["savings_rate"] == 0
+    assert result["debt_ratio"] == 0
+    assert result["emergency_months"] == 0
+    assert result["flag_savings_rate"]
+    assert not result["flag_deficit"]
+    assert np.isfinite(result["score"])
+
+
+def test_deficit_is_flagged():
+    result = evaluate_one(10_000_000, 12_000_000, 0, 0)
+    assert result["surplus"] == -2_000_000
+    assert result["flag_deficit"]
+    assert result["score_deficit"] == 0
+
+
+def test_zero_target_rule_scores_as_pass_fail():
+    at_threshold = evaluate_one(10_000_000, 10_000_000, 0, 0)
+    assert not at_threshold["flag_deficit"]
+    assert at_threshold["score_deficit"] == 1
+    assert evaluate_one(10_000_000, 10_000_001, 0, 0)["score_deficit"] == 0
+
+
+def test_graded_scores_for_min_and_max_rules():
+    result = evaluate_one(10_000_000, 9_000_000, 4_500_000, 27_000_000)
+    assert result["score_savings_rate"] == pytest.approx(0.5)  # 10% of a 20% target
+    assert result["score_debt_ratio"] == pytest.approx(0.5)  # 45% is halfway to 2x 30%
+    assert result["score_emergency_fund"] == pytest.approx(0.5)  # 3 of 6 months
+
+
+def test_batch_shape_matches_scalar_evaluation():
+    rng = np.random.default_rng(0)
+    n = 1000
+    income = rng.uniform(0, 5e7, n)
+    expenses = rng.uniform(0, 5e7, n)
+    debt = rng.uniform(0, 1e7, n)
+    fund = rng.uniform(0, 2e8, n)
+    batch = evaluate_health(health_metrics(income, expenses, debt, fund))
+
+    assert len(batch) == n
+    assert {"score", "flag_savings_rate", "score_emergency_fund"} <= set(batch.columns)
+    assert batch["score"].between(0, 100).all()
+    single = evaluate_one(income[7], expenses[7], debt[7], fund[7])
+    pd.testing.assert_series_equal(batch.iloc[7], single, check_names=False)
+
+
+def test_scalars_broadcast_against_arrays():
+    metrics = health_metrics(np.array([1e7, 2e7, 3e7]), 8e6, 0, 0)
+    assert len(metrics) == 3
+
+
+def test_projection_metrics_accumulate_emergency_fund():
+    projection = pd.DataFrame({"Pendapatan": [10e6] * 3, "Pengeluaran": [5e6] * 3})
+    metrics = projection_metrics(projection, 0, 5e6, emergency_balance=5e6)
+    np.testing.assert_allclose(metrics["emergency_months"], [2.0, 3.0, 4.0])
+
+
+def test_recommendations_format_metric_values():
+    result = evaluate_one(10_000_000, 12_000_000, 4_000_000, 1_234_567)
+    messages = health_recommendations(result)
+    assert len(messages) == 4
+    assert "Dana darurat Anda hanya 0.1 bulan" in messages[2]
+    assert messages == [
+        message.format(**result) for message in HEALTH_RULES["message"]
+    ]
+
+
+def test_missing_metrics_are_flagged_and_score_zero():
+    metrics = health_metrics([10_000_000, 10_000_000], 5_000_000, 0, 60_000_000)
+    metrics.loc[1, ["surplus", "emergency_months"]] = np.nan
+    result = evaluate_health(metrics)
+
+    assert not result.loc[0, "flag_deficit"]
+    assert result.loc[1, "flag_deficit"]
+    assert result.loc[1, "flag_emergency_fund"]
+    assert result.loc[1, "score_deficit"] == 0
+    assert result.loc[1, "score_emergency_fund"] == 0
+    assert result.loc[1, "score"] == pytest.approx(60.0)  # only savings and debt rules pass
+    assert len(health_recommendations(result.loc[1])) == 2
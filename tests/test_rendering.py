@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from rendering import downsample_frame, lttb_indices, page_bounds, projection_chart
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    values = np.sin(np.linspace(0, 50, 10000))
+    idx = lttb_indices(values, 300)
+    assert len(idx) == 300
+    assert idx[0] == 0
+    assert idx[-1] == len(values) - 1
+
+
+def test_lttb_indices_strictly_increasing():
+    values = np.random.default_rng(0).normal(size=5000).cumsum()
+    idx = lttb_indices(values, 250)
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_returns_all_points_under_budget():
+    np.testing.assert_array_equal(lttb_indices([1.0, 2.0, 3.0], 10), np.arange(3))
+
+
+def test_lttb_keeps_spike():
+    values = np.zeros(1000)
+    values[537] = 100.0
+    assert 537 in lttb_indices(values, 50)
+
+
+def test_downsample_frame_respects_budget():
+    df = pd.DataFrame({"a": np.arange(2000.0), "b": np.cos(np.arange(2000.0))})
+    out = downsample_frame(df, ["a", "b"], budget=200)
+    assert len(out) <= 200
+    assert out.index.is_monotonic_increasing
+    assert len(downsample_frame(df.head(50), ["a"], budget=200)) == 50
+
+
+def test_projection_chart_switches_to_webgl_above_budget():
+    df = pd.DataFrame({"Bulan": [f"M{i}" for i in range(600)], "Tabungan": np.arange(600.0)})
+    small = projection_chart(df.head(36), y="Tabungan")
+    large = projection_chart(df, y="Tabungan", budget=100)
+    assert small.data[0].type == "scatter"
+    assert large.data[0].type == "scattergl"
+    assert len(large.data[0].x) <= 100
+
+
+def test_page_bounds():
+    assert page_bounds(600, 1, 120) == (5, 0, 120)
+    assert page_bounds(600, 5, 120) == (5, 480, 600)
+    assert page_bounds(601, 6, 120) == (6, 600, 601)
+
+
+def test_page_bounds_clamps_out_of_range_pages():
+    assert page_bounds(250, 0, 120) == (3, 0, 120)
+    assert page_bounds(250, 99, 120) == (3, 240, 250)
+    assert page_bounds(0, 1, 120) == (1, 0, 0)
+
+
+def test_decimated_trace_keeps_original_month_positions():
+    values = np.sin(np.linspace(0, 20, 600)) * np.arange(600.0)
+    df = pd.DataFrame({"Bulan": [f"M{i}" for i in range(600)], "Tabungan": values})
+    fig = projection_chart(df, y="Tabungan", budget=100)
+    x = np.asarray(fig.data[0].x)
+    assert x.dtype.kind in "iu"
+    assert np.all(np.diff(x) > 0)
+    assert np.any(np.diff(x) > 1)  # irregular gaps stay visible on the axis
+    np.testing.assert_allclose(fig.data[0].y, values[x])
+    assert fig.layout.xaxis.ticktext[0] == "M0"
+    assert fig.layout.xaxis.ticktext[-1] == "M599"
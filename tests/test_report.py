@@ -0,0 +1,74 @@
+import os
+import stat
+import warnings
+
+from report import ReportService, generate_reports, pdf_text, plan_hash, render_report
+
+
+def make_plan(expense=9_000_000.0, months=12, recommendations=None):
+    projection = [
+        {
+            "Bulan": f"Bulan {i + 1}",
+            "Pendapatan": 50_000_000.0,
+            "Pengeluaran": expense,
+            "Tabungan": 50_000_000.0 - expense,
+            "Akumulasi Tabungan": (50_000_000.0 - expense) * (i + 1),
+        }
+        for i in range(months)
+    ]
+    return {
+        "planning_months": months,
+        "summary": {"Pendapatan": 50_000_000.0, "Kebutuhan Pokok": expense, "Transportasi": 0.0},
+        "projection": projection,
+        "health": {"emergency_months": 1.5, "debt_ratio": 0.0, "savings_rate": 82.0, "score": 80.0},
+        "recommendations": recommendations or ["🎉 Keuangan Anda dalam kondisi sehat! Pertahankan kebiasaan baik ini"],
+        "tips": ["✅ " + "Lakukan review keuangan mingguan bersama keluarga " * 5],
+    }
+
+
+def test_pdf_text_drops_missing_glyphs():
+    assert pdf_text("💡 Tingkatkan rasio tabungan") == "Tingkatkan rasio tabungan"
+    assert pdf_text("Rp 1,000 (ideal 3-6 bulan)") == "Rp 1,000 (ideal 3-6 bulan)"
+
+
+def test_render_report_has_no_missing_glyph_warnings():
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="Glyph .* missing")
+        report = render_report(make_plan())
+    assert report["pdf"].startswith(b"%PDF")
+
+
+def test_render_report_with_zero_expenses():
+    report = render_report(make_plan(expense=0.0))
+    assert report["pdf"].startswith(b"%PDF")
+
+
+def test_render_html_escapes_text():
+    report = render_report(make_plan(recommendations=["<script>alert(1)</script> & co"]))
+    page = report["html"].decode("utf-8")
+    assert "<script>" not in page
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; co" in page
+    assert "Rekomendasi &amp; Tips" in page
+
+
+def test_generate_reports_collects_failures(tmp_path):
+    good = make_plan()
+    bad = {"planning_months": 1}
+    results = generate_reports([good, bad, good], str(tmp_path), max_workers=2)
+    assert set(results) == {plan_hash(good), plan_hash(bad)}
+    assert os.path.exists(results[plan_hash(good)]["pdf"])
+    assert "error" in results[plan_hash(bad)]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    umask = os.umask(0)
+    os.umask(umask)
+    for path in results[plan_hash(good)].values():
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+
+def test_report_service_missing_and_done():
+    service = ReportService(max_workers=1)
+    assert service.status("unknown") == "missing"
+    assert service.result("unknown") is None
+    key = service.submit(make_plan())
+    assert service.wait(key, timeout=60) == "done"
+    assert service.result(key)["html"].startswith(b"<!DOCTYPE html>")